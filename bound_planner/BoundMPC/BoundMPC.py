@@ -236,16 +236,16 @@ class BoundMPC:
             "ipopt": ipopt_options,
             # 'fatrop': fatrop_options,
         }
-        # Setup the optimization problem in casadi syntax
-        self.solver, self.lbg, self.ubg = setup_optimization_problem(
-            self.N,
-            self.nr_joints,
-            self.nr_segs,
-            self.dt,
-            self.solver_opts,
-        )
         limits_path = ""
         if self.build:
+            # Setup the optimization problem in casadi syntax
+            self.solver, self.lbg, self.ubg = setup_optimization_problem(
+                self.N,
+                self.nr_joints,
+                self.nr_segs,
+                self.dt,
+                self.solver_opts,
+            )
             codegenopt = {"cpp": True}
             limits = {}
             limits["lbg"] = np.array(self.lbg)
@@ -340,16 +340,18 @@ class BoundMPC:
         dp_ref_proj = np.empty_like(dp_normed_ref)
         br1_proj = np.empty_like(br1)
         br2_proj = np.empty_like(br2)
+        # Terms of the initial orientation error are the same for all columns
+        dtau_init = self.dtau_init[:, 0]
+        r_dtau_init = R.from_rotvec(dtau_init).as_matrix()
+        jac_dtau_r = jac_SO3_inv_right(dtau_init)
+        jac_dtau_l = jac_SO3_inv_left(dtau_init)
         for i in range(dp_normed_ref.shape[1]):
             dtau_rest1 = (
-                R.from_rotvec(self.dtau_init[:, 0]).as_matrix()
-                @ R.from_rotvec(self.dtau_init_orth1[:, i]).as_matrix().T
+                r_dtau_init @ R.from_rotvec(self.dtau_init_orth1[:, i]).as_matrix().T
             )
             dtau_rest2 = (
                 dtau_rest1 @ R.from_rotvec(self.dtau_init_par[:, i]).as_matrix().T
             )
-            jac_dtau_r = jac_SO3_inv_right(self.dtau_init[:, 0])
-            jac_dtau_l = jac_SO3_inv_left(self.dtau_init[:, 0])
             jac_r1_r = jac_SO3_inv_right(R.from_matrix(dtau_rest1).as_rotvec())
             jac_r2_r = jac_SO3_inv_right(R.from_matrix(dtau_rest2).as_rotvec())
 
@@ -374,15 +376,16 @@ class BoundMPC:
             g = v1
             h = v2
             i = v3
+            den = a * d * e - a * f * f - b * b * d + 2 * b * c * f - c * c * e
             v_1[:, j] = (
-                -b * d * h + b * f * i - c * e * i + c * f * h + d * e * g - f**2 * g
-            ) / (a * d * e - a * f**2 - b**2 * d + 2 * b * c * f - c**2 * e)
+                -b * d * h + b * f * i - c * e * i + c * f * h + d * e * g - f * f * g
+            ) / den
             v_2[:, j] = (
-                a * d * h - a * f * i + b * c * i - b * d * g - c**2 * h + c * f * g
-            ) / (a * d * e - a * f**2 - b**2 * d + 2 * b * c * f - c**2 * e)
+                a * d * h - a * f * i + b * c * i - b * d * g - c * c * h + c * f * g
+            ) / den
             v_3[:, j] = (
-                a * e * i - a * f * h - b**2 * i + b * c * h + b * f * g - c * e * g
-            ) / (a * d * e - a * f**2 - b**2 * d + 2 * b * c * f - c**2 * e)
+                a * e * i - a * f * h - b * b * i + b * c * h + b * f * g - c * e * g
+            ) / den
         return v_1, v_2, v_3, jac_dtau_l, jac_dtau_r
 
     def step(self, q0, dq0, ddq0, p0, v0, jerk_current, qf=np.zeros(7)):
@@ -477,8 +480,8 @@ class BoundMPC:
             [np.min((self.phi_current[0] + 5.0, x_phi_d_current[0]))]
         )
 
-        p_list = [self.robot_model.fk_pos_col(q0, i) for i in range(6)]
-        p_list_f = [self.robot_model.fk_pos_col(qf, i) for i in range(6)]
+        p_list = self.robot_model.fk_pos_cols(q0, 6)
+        p_list_f = self.robot_model.fk_pos_cols(qf, 6)
         set_joints = []
         joint_sizes = self.robot_model.col_joint_sizes
         start_j = time.perf_counter()
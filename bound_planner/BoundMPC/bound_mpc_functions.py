@@ -103,10 +103,6 @@ def reference_function(
     a_set,
     b_set,
 ):
-    if isinstance(dp_ref, np.ndarray):
-        p_d = np.zeros(6)
-    else:
-        p_d = ca.SX.zeros((6, 1))
     dp_d, dp_d_next = get_current_segments_split(idx, split_idx, dp_ref)
     phi_start, phi_end = get_current_segments_split(idx, split_idx, phi_switch)
     p_ref_current, p_ref_next = get_current_segments_split(idx, split_idx, p_ref)
@@ -116,13 +112,16 @@ def reference_function(
     if isinstance(dp_ref, np.ndarray):
         dphi = np.array(dphi).flatten()
         phi = np.array(phi).flatten()
+        p_d = np.empty(6)
         p_d[:3] = p_ref_current[:3].T + dp_d[:3].T * phi
         p_d[3:] = dp_d[3:].T * phi + p_ref_current[3:].T
         p_dr_next = dp_d_next[3:].T * phi_next + p_ref_next[3:].T
         dp_d[:3] = dp_d[:3].T
     else:
-        p_d[:3] = p_ref_current[:3] + dp_d[:3] * phi
-        p_d[3:] = dp_d[3:] * phi + p_ref_current[3:]
+        p_d = ca.vertcat(
+            (p_ref_current[:3] + dp_d[:3] * phi).T,
+            (dp_d[3:] * phi + p_ref_current[3:]).T,
+        )
         p_dr_next = dp_d_next[3:] * phi_next + p_ref_next[3:]
     phi += phi_start
 
@@ -478,9 +477,8 @@ def integration_function(
 
     robot_model = RobotModel()
     pn_pos = robot_model.fk_pos(qn)
-    v_cart = robot_model.velocity_ee(qn, dqn)
-    v_rot = robot_model.omega_ee(qn, dqn)
-    vn = ca.vertcat(v_cart, v_rot)
+    vn = robot_model.twist_ee(qn, dqn)
+    v_rot = vn[3:]
 
     # RK4 integration of omega
     # pn_rot = p_rot + dt * omega_ee(q, dq)
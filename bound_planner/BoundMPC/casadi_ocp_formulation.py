@@ -118,13 +118,9 @@ def setup_optimization_problem(
             + u[k + 1, :] * dt**2 / 6.0
         )
         ddq_new = ddq[k, :] + u[k, :] * dt / 2.0 + u[k + 1, :] * dt / 2.0
-        v_cart = robot_model.velocity_ee(q[k + 1, :].T, dq[k + 1, :].T)
-        v_rot = robot_model.omega_ee(q[k + 1, :].T, dq[k + 1, :].T)
-        # v_cart = robot_model.velocity_ee(q_new.T, dq_new.T)
-        # v_rot = robot_model.omega_ee(q_new.T, dq_new.T)
-        v_new = ca.vertcat(v_cart, v_rot).T
+        v_new = robot_model.twist_ee(q[k + 1, :].T, dq[k + 1, :].T).T
+        # v_new = robot_model.twist_ee(q_new.T, dq_new.T).T
 
-        robot_model = RobotModel()
         pn_pos = robot_model.fk_pos(q[k + 1, :].T).T
         k1 = v[k, 3:]
         k2 = v[k + 1, 3:]
@@ -5,7 +5,7 @@ import copy
 
 def calcJ0(c1, p, h, t):
     if c1 <= t and t <= c1 + h:
-        j0 = p * (c1 + h - t) / h
+        j0 = p * ((c1 + h - t) / h)
     else:
         j0 = 0
     return j0
@@ -13,7 +13,7 @@ def calcJ0(c1, p, h, t):
 
 def calcJn(c1, p, h, t):
     if c1 <= t and t <= c1 + h:
-        jn = p * (t - c1) / h
+        jn = p * ((t - c1) / h)
     else:
         jn = 0
     return jn
@@ -21,9 +21,9 @@ def calcJn(c1, p, h, t):
 
 def calcJk(c1, p, h, t):
     if c1 <= t and t <= c1 + h:
-        jk = p * (t - c1) / h
+        jk = p * ((t - c1) / h)
     elif c1 + h < t and t <= c1 + 2 * h:
-        jk = p * (c1 + 2 * h - t) / h
+        jk = p * ((c1 + 2 * h - t) / h)
     else:
         jk = 0
     return jk
@@ -45,9 +45,9 @@ def calcJerk(traj, t, h):
 
 def calcA0(c1, p, h, t):
     if c1 < t and t <= c1 + h:
-        a0 = -p * (t - c1) * (t - 2 * h - c1) / h / 2
+        a0 = p * (-(t - c1) * (t - 2 * h - c1) / (2 * h))
     elif t > c1 + h:
-        a0 = p * h / 2
+        a0 = p * (0.5 * h)
     else:
         a0 = 0
     return a0
@@ -55,9 +55,9 @@ def calcA0(c1, p, h, t):
 
 def calcAn(c1, p, h, t):
     if c1 < t and t <= c1 + h:
-        an = p * (t - c1)**2 / h / 2
+        an = p * ((t - c1)**2 / (2 * h))
     elif t > c1 + h:
-        an = p * h / 2
+        an = p * (0.5 * h)
     else:
         an = 0
     return an
@@ -65,9 +65,9 @@ def calcAn(c1, p, h, t):
 
 def calcAk(c1, p, h, t):
     if c1 < t and t <= c1 + h:
-        ak = p * (t - c1)**2 / h / 2
+        ak = p * ((t - c1)**2 / (2 * h))
     elif c1 + h < t and t <= c1 + 2 * h:
-        ak = -(h * h + (-2 * t + 2 * c1) * h + (t - c1)**2 / 2) * p / h
+        ak = p * (-(h * h + (-2 * t + 2 * c1) * h + 0.5 * (t - c1)**2) / h)
     elif t > c1 + 2 * h:
         ak = p * h
     else:
@@ -89,9 +89,9 @@ def calcAcceleration(traj, t, a_init, h):
 
 def calcV0(c1, p, h, t):
     if c1 < t and t <= c1 + h:
-        v0 = -p * (t - c1)**2 * (t-3 * h - c1) / h / 6
+        v0 = p * (-(t - c1)**2 * (t - 3 * h - c1) / (6 * h))
     elif t > c1 + h:
-        v0 = p * h * (3 * t - h - 3 * c1) / 6
+        v0 = p * (h * (3 * t - h - 3 * c1) / 6)
     else:
         v0 = 0
     return v0
@@ -99,9 +99,9 @@ def calcV0(c1, p, h, t):
 
 def calcVn(c1, p, h, t):
     if c1 < t and t <= c1 + h:
-        vn = -p * (-t + c1)**3 / h / 6
+        vn = p * (-(-t + c1)**3 / (6 * h))
     elif t > c1 + h:
-        vn = p * h * (3 * t - 2 * h - 3 * c1) / 6
+        vn = p * (h * (3 * t - 2 * h - 3 * c1) / 6)
     else:
         vn = 0
     return vn
@@ -109,11 +109,11 @@ def calcVn(c1, p, h, t):
 
 def calcVk(c1, p, h, t):
     if c1 < t and t <= c1 + h:
-        vk = -p * (-t + c1)**3 / h / 6
+        vk = p * (-(-t + c1)**3 / (6 * h))
     elif c1 + h < t and t <= c1 + 2 * h:
-        vk = p * (h**3 + (-3 * t + 3 * c1) * h * h + 3 * (t - c1)**2 * h - (t - c1)**3 / 2) / h / 3
+        vk = p * ((h**3 + (-3 * t + 3 * c1) * h * h + 3 * (t - c1)**2 * h - 0.5 * (t - c1)**3) / (3 * h))
     elif t > c1 + 2 * h:
-        vk = -h * p * (c1 + h - t)
+        vk = p * (-h * (c1 + h - t))
     else:
         vk = 0
     return vk
@@ -133,9 +133,9 @@ def calcVelocity(traj, t, v_init, a_init, h):
 
 def calcQ0(c1, p, h, t):
     if c1 < t and t <= c1 + h:
-        q0 = -p * (t - c1)**3 * (t - 4 * h - c1) / h / 24
+        q0 = p * (-(t - c1)**3 * (t - 4 * h - c1) / (24 * h))
     elif t > c1 + h:
-        q0 = p * (h * h / 6 + (-2 / 3 * t + 2 / 3 * c1) * h + (t - c1)**2) * h / 4
+        q0 = p * ((h * h / 6 + (-2 / 3 * t + 2 / 3 * c1) * h + (t - c1)**2) * h / 4)
     else:
         q0 = 0
     return q0
@@ -143,9 +143,9 @@ def calcQ0(c1, p, h, t):
 
 def calcQn(c1, p, h, t):
     if c1 < t and t <= c1 + h:
-        qn = p * (-t + c1)**4 / h / 24
+        qn = p * ((-t + c1)**4 / (24 * h))
     elif t > c1 + h:
-        qn = p * h * (h * h / 2 + (-4 / 3 * t + 4 / 3 * c1) * h + (t - c1)**2) / 4
+        qn = p * (h * (0.5 * h * h + (-4 / 3 * t + 4 / 3 * c1) * h + (t - c1)**2) / 4)
     else:
         qn = 0
     return qn
@@ -153,18 +153,18 @@ def calcQn(c1, p, h, t):
 
 def calcQk(c1, p, h, t):
     if c1 < t and t <= c1 + h:
-        qk = p * (-t + c1)**4 / h / 24
+        qk = p * ((-t + c1)**4 / (24 * h))
     elif c1 + h < t and t <= c1 + 2 * h:
-        qk = -(h**4 + (-4 * t + 4 * c1) * h**3 + 6 * (t - c1)**2 * h * h - 4 * (t - c1)**3 * h + (t - c1)**4 / 2) * p / h / 12
+        qk = p * (-(h**4 + (-4 * t + 4 * c1) * h**3 + 6 * (t - c1)**2 * h * h - 4 * (t - c1)**3 * h + 0.5 * (t - c1)**4) / (12 * h))
     elif t > c1 + 2 * h:
-        qk = 7 / 12 * h * (h * h + (-12 / 7 * t + 12 / 7 * c1) * h + 6 / 7 * (t - c1)**2) * p
+        qk = p * (7 / 12 * h * (h * h + (-12 / 7 * t + 12 / 7 * c1) * h + 6 / 7 * (t - c1)**2))
     else:
         qk = 0
     return qk
 
 
 def calcAngle(traj, t, q_init, v_init, a_init, h):
-    ang_full = a_init * t**2 / 2 + v_init * t + q_init
+    ang_full = a_init * (0.5 * t * t) + v_init * t + q_init
     for j in range(traj.shape[1]):
         if j == 0:
             ang_full = ang_full + calcQ0((j) * h, traj[:, j], h, t)
@@ -1,18 +1,52 @@
+import os
+from functools import lru_cache
 from pathlib import Path
 
 import casadi as ca
 import numpy as np
 import pinocchio as pin
-from scipy.spatial.transform import Rotation as R
+from scipy.optimize import least_squares
 
 GEN_CA = False
 CA_SAVE_PATH = "bound_planner/RobotModel/"
 USE_IIWA = True
+# Compile the IK solver functions with the system C compiler
+JIT_IK = False
+# Pose error below which the least squares IK solution is accepted
+IK_TOL_POS = 1e-4
+IK_TOL_ROT = 1e-3
 if GEN_CA:
     from pinocchio import casadi as cpin
 
 
+@lru_cache(maxsize=None)
+def load_ca_function(name):
+    """Load a saved kinematics function once and share it between calls."""
+    return ca.Function.load(f"{CA_SAVE_PATH}{name}.ca")
+
+
+@lru_cache(maxsize=32)
+def map_ca_function(name, n):
+    """Map a saved kinematics function over n samples evaluated in parallel."""
+    return load_ca_function(name).map(n, "thread", os.cpu_count() or 1)
+
+
+@lru_cache(maxsize=None)
+def acceleration_function():
+    """Build the end effector acceleration J ddq + dJ dq from the saved
+    jacobian, where dJ dq is the directional derivative of J dq along dq.
+    """
+    q = ca.SX.sym("q", 7)
+    dq = ca.SX.sym("dq", 7)
+    ddq = ca.SX.sym("ddq", 7)
+    jac = load_ca_function("jacobian")(q)
+    a = ca.cse(jac @ ddq + ca.jtimes(jac @ dq, q, dq))
+    return ca.Function("acceleration", [q, dq, ddq], [a])
+
+
 class RobotModel:
+    _ik_solver = None
+
     def __init__(self):
         model_path = Path(__file__).parent
         if USE_IIWA:
@@ -23,6 +57,8 @@ class RobotModel:
         self.model, collision_model, visual_model = pin.buildModelsFromUrdf(
             urdf_model_path, package_dirs=model_path
         )
+        # Shared workspace for the numeric kinematics, results are copied out
+        self.data = self.model.createData()
         self.ee_id = self.model.getFrameId("end_effector_link")
         self.col_ids = [
             self.model.getJointId("joint_3"),
@@ -48,8 +84,8 @@ class RobotModel:
             self.q_lim_upper[[0, 2, 4, 6]] = np.inf
         self.dq_lim_lower = -self.model.velocityLimit
         self.dq_lim_upper = self.model.velocityLimit
-        self.tau_lim_lower = [-320, -320, -176, -176, -110, -40, -40]
-        self.tau_lim_upper = [320, 320, 176, 176, 110, 40, 40]
+        self.tau_lim_upper = np.array([320.0, 320, 176, 176, 110, 40, 40])
+        self.tau_lim_lower = -self.tau_lim_upper
         self.u_max = 35
         self.u_min = -35
 
@@ -70,22 +106,49 @@ class RobotModel:
     def forward_kinematics(self, q: np.ndarray, dq: np.ndarray):
         """Compute forward kinematics to get the position of the end effector in
         cartesian space. Also computes the jacobian and its derivative.
+
+        All three quantities are read from a single kinematics pass.
         """
-        jac_ee = self.jacobian_fk(q)
-        djac_ee = self.djacobian_fk(q, dq)
-        p_robot = self.fk(q)
+        data = self.data
+        pin.computeJointJacobiansTimeVariation(self.model, data, q, dq)
+        pin.updateFramePlacement(self.model, data, self.ee_id)
+        jac_ee = pin.getFrameJacobian(
+            self.model, data, self.ee_id, pin.LOCAL_WORLD_ALIGNED
+        )
+        djac_ee = pin.getFrameJacobianTimeVariation(
+            self.model, data, self.ee_id, pin.LOCAL_WORLD_ALIGNED
+        )
+        h = data.oMf[self.ee_id]
+        p_robot = np.empty(6)
+        p_robot[:3] = h.translation
+        p_robot[3:] = pin.log3(h.rotation)
         return p_robot, jac_ee, djac_ee
 
     def setup_ik_problem(self):
+        self.lbu = self.q_lim_lower
+        self.ubu = self.q_lim_upper
+        # Parameter buffer [pd, vec(rd)] filled in place for every IK call
+        self.ik_params = np.empty(12)
+        # Last IK solution and its bound multipliers for warm starting
+        self.q_ik = np.zeros(7)
+        self.lam_x_ik = np.zeros(7)
+        # The solver only depends on the kinematics, so all instances share it
+        if RobotModel._ik_solver is None:
+            RobotModel._ik_solver = self._build_ik_solver()
+        self.ik_solver = RobotModel._ik_solver
+
+    def _build_ik_solver(self):
         q = ca.SX.sym("q", 7)
         pd = ca.SX.sym("p desired", 3)
         rd = ca.SX.sym("r desired", 3, 3)
-        r_ee = self.hom_transform_endeffector(q)[:3, :3]
-        J = ca.sumsqr(self.fk_pos(q) - pd[:3])
-        J += ca.sumsqr(r_ee @ rd.T - ca.SX.eye(3))
+        h_ee = self.hom_transform_endeffector(q)
+        p_ee = h_ee[:3, 3]
+        r_ee = h_ee[:3, :3]
+        J = ca.sumsqr(p_ee - pd[:3])
+        # Equal to sumsqr(r_ee @ rd.T - I) for rotation matrices
+        J += 6 - 2 * ca.sum1(ca.sum2(r_ee * rd))
+        J = ca.cse(J)
         w = [q]
-        lbw = self.q_lim_lower
-        ubw = self.q_lim_upper
 
         params = ca.vertcat(pd, rd.reshape((-1, 1)))
 
@@ -95,8 +158,6 @@ class RobotModel:
             # 'g': ca.vertcat(*g),
             "p": params,
         }
-        self.lbu = lbw
-        self.ubu = ubw
         # lbg = lbg
         # ubg = ubg
         ipopt_options = {
@@ -114,6 +175,9 @@ class RobotModel:
             "print_info_string": "no",
             "fast_step_computation": "yes",
             "warm_start_init_point": "yes",
+            "warm_start_bound_push": 1e-6,
+            "warm_start_mult_bound_push": 1e-6,
+            "warm_start_slack_bound_push": 1e-6,
             "mu_oracle": "loqo",
             "fixed_mu_oracle": "quality-function",
             "line_search_method": "filter",
@@ -127,144 +191,367 @@ class RobotModel:
             "print_time": False,
             "ipopt": ipopt_options,
         }
-        self.ik_solver = ca.nlpsol("solver", "ipopt", prob, solver_opts)
-
-    def inverse_kinematics(self, pd, rd, q0):
-        """Inverse kinematics based on optimization."""
-        params = np.concatenate((pd, rd.T.flatten()))
-        sol = self.ik_solver(x0=q0, lbx=self.lbu, ubx=self.ubu, p=params)
-        q_ik = np.array(sol["x"]).flatten()
-        if not self.ik_solver.stats()["success"]:
+        if JIT_IK:
+            solver_opts["jit"] = True
+            solver_opts["compiler"] = "shell"
+            solver_opts["jit_options"] = {
+                "flags": ["-O3", "-march=native"],
+                "verbose": False,
+            }
+        return ca.nlpsol("solver", "ipopt", prob, solver_opts)
+
+    def inverse_kinematics(self, pd, rd, q0=None, verbose=False):
+        """Inverse kinematics based on optimization. The box constrained least
+        squares problem is solved with a trust region method using the
+        analytical jacobian, Ipopt is only used if that fails. Without an
+        initial guess q0 the solvers are warm started from the previous
+        solution, which is the common case when tracking a path. The remaining
+        pose error is reported if verbose is set or the target pose was not
+        reached by the least squares solve.
+        """
+        if q0 is None:
+            q0 = self.q_ik
+            lam_x0 = self.lam_x_ik
+        else:
+            lam_x0 = 0
+        sol = least_squares(
+            self._ik_residual,
+            np.clip(q0, self.lbu, self.ubu),
+            jac=self._ik_jacobian,
+            bounds=(self.lbu, self.ubu),
+            method="dogbox",
+            x_scale="jac",
+            args=(pd, rd),
+        )
+        # A met stopping tolerance does not mean that the pose was reached
+        reached = (
+            sol.success
+            and np.linalg.norm(sol.fun[:3]) < IK_TOL_POS
+            and np.linalg.norm(sol.fun[3:]) < IK_TOL_ROT
+        )
+        success = reached
+        if reached:
+            q_ik = sol.x
+            self.lam_x_ik = np.zeros_like(q_ik)
+        else:
+            params = self.ik_params
+            params[:3] = pd
+            params[3:].reshape(3, 3)[:] = rd.T
+            sol = self.ik_solver(
+                x0=q0, lam_x0=lam_x0, lbx=self.lbu, ubx=self.ubu, p=params
+            )
+            q_ik = np.array(sol["x"]).flatten()
+            self.lam_x_ik = np.array(sol["lam_x"]).flatten()
+            success = self.ik_solver.stats()["success"]
+        self.q_ik = q_ik.copy()
+        if not success:
             print("(IK) ERROR No convergence in IK optimization")
-        h_ik = self.hom_transform_endeffector(q_ik)
-        pos_error = np.linalg.norm(pd - h_ik[:3, 3])
-        rot_error = np.linalg.norm(R.from_matrix(h_ik[:3, :3] @ rd.T).as_rotvec())
-        print(f"(IK) Position error {pos_error}m")
-        print(f"(IK) Rotation error {rot_error * 180 / np.pi} deg")
+        if verbose or not reached:
+            h_ik = self.hom_transform_endeffector(q_ik)
+            pos_error = np.linalg.norm(pd - h_ik[:3, 3])
+            rot_error = np.linalg.norm(pin.log3(h_ik[:3, :3] @ rd.T))
+            print(f"(IK) Position error {pos_error}m")
+            print(f"(IK) Rotation error {rot_error * 180 / np.pi} deg")
         return q_ik
 
-    def fk_pos(self, q):
+    def _ik_residual(self, q, pd, rd):
+        """Residual of the IK problem, position error and the rotation vector
+        of r_ee @ rd.T.
+        """
+        pin.forwardKinematics(self.model, self.data, q)
+        h = pin.updateFramePlacement(self.model, self.data, self.ee_id)
+        res = np.empty(6)
+        res[:3] = h.translation - pd
+        res[3:] = pin.log3(h.rotation @ rd.T)
+        return res
+
+    def _ik_jacobian(self, q, pd, rd):
+        """Jacobian of the IK residual. A rotation of the end effector by w in
+        the world frame changes the error rotation r_err = r_ee @ rd.T from the
+        left, so the rotation vector changes by Jlog3(r_err) @ r_err.T @ w.
+        """
+        jac = pin.computeFrameJacobian(
+            self.model, self.data, q, self.ee_id, pin.LOCAL_WORLD_ALIGNED
+        )
+        r_err = self.data.oMf[self.ee_id].rotation @ rd.T
+        jac_res = np.empty_like(jac)
+        jac_res[:3] = jac[:3]
+        jac_res[3:] = pin.Jlog3(r_err) @ r_err.T @ jac[3:]
+        return jac_res
+
+    def fk_pos(self, q, out=None):
+        """Compute the end effector position. For numeric joint angles the
+        result can be written into the preallocated array out.
+        """
         if isinstance(q, np.ndarray):
-            data = self.model.createData()
-            pin.framesForwardKinematics(self.model, data, q)
-        elif GEN_CA:
+            return self._fk_pos_np(q, out)
+        return self._fk_pos_sx(q)
+
+    def _fk_pos_np(self, q, out=None):
+        pin.forwardKinematics(self.model, self.data, q)
+        h = pin.updateFramePlacement(self.model, self.data, self.ee_id)
+        if out is None:
+            return h.translation.copy()
+        out[:] = h.translation
+        return out
+
+    def _fk_pos_sx(self, q):
+        if GEN_CA:
             data = self.cmodel.createData()
             cpin.framesForwardKinematics(self.cmodel, data, q)
-        if isinstance(q, np.ndarray) or GEN_CA:
             p = data.oMf[self.ee_id].translation
-            if GEN_CA and not isinstance(q, np.ndarray):
-                ca.Function("p", [q], [p]).save(f"{CA_SAVE_PATH}fk_pos.ca")
-        else:
-            p_fun = ca.Function.load(f"{CA_SAVE_PATH}fk_pos.ca")
-            p = p_fun(q)
-        return p
+            ca.Function("p", [q], [p]).save(f"{CA_SAVE_PATH}fk_pos.ca")
+            return p
+        return load_ca_function("fk_pos")(q)
+
+    def fk_pos_batch(self, qs):
+        """Compute the end effector positions for the joint configurations in
+        the rows of qs. Returns an array of shape (N, 3).
+        """
+        if qs.shape[0] == 0:
+            return np.empty((0, 3))
+        p_fun = map_ca_function("fk_pos", qs.shape[0])
+        return np.array(p_fun(qs.T)).T
 
     def fk_pos_col(self, q, i):
         if isinstance(q, np.ndarray):
-            data = self.model.createData()
-            pin.forwardKinematics(self.model, data, q)
-            pin.framesForwardKinematics(self.model, data, q)
-        elif GEN_CA:
+            return self._fk_pos_col_np(q, i)
+        return self._fk_pos_col_sx(q, i)
+
+    def _fk_pos_col_np(self, q, i):
+        pin.forwardKinematics(self.model, self.data, q)
+        return self._col_position_np(i)
+
+    def _col_position_np(self, i):
+        """Read collision point i from data updated by forwardKinematics. The
+        first five points are joints, the remaining ones are frames.
+        """
+        if i < 5:
+            return self.data.oMi[self.col_ids[i]].translation.copy()
+        h = pin.updateFramePlacement(self.model, self.data, self.col_ids[i])
+        return h.translation.copy()
+
+    def _fk_pos_col_sx(self, q, i):
+        if GEN_CA:
             data = self.cmodel.createData()
             cpin.forwardKinematics(self.cmodel, data, q)
             cpin.framesForwardKinematics(self.cmodel, data, q)
-        if isinstance(q, np.ndarray) or GEN_CA:
             if i < 5:
                 p = data.oMi[self.col_ids[i]].translation
             else:
                 p = data.oMf[self.col_ids[i]].translation
-            if GEN_CA and not isinstance(q, np.ndarray):
-                ca.Function("p", [q], [p]).save(f"{CA_SAVE_PATH}fk_pos_col_{i}.ca")
-        else:
-            p_fun = ca.Function.load(f"{CA_SAVE_PATH}fk_pos_col_{i}.ca")
-            p = p_fun(q)
-        return p
+            ca.Function("p", [q], [p]).save(f"{CA_SAVE_PATH}fk_pos_col_{i}.ca")
+            return p
+        return load_ca_function(f"fk_pos_col_{i}")(q)
+
+    def fk_pos_cols(self, q, n=None):
+        """Compute the positions of the first n collision points. For numeric
+        joint angles the forward kinematics are evaluated only once.
+        """
+        if n is None:
+            n = len(self.col_ids)
+        if isinstance(q, np.ndarray):
+            return self._fk_pos_cols_np(q, n)
+        return [self._fk_pos_col_sx(q, i) for i in range(n)]
+
+    def _fk_pos_cols_np(self, q, n):
+        pin.forwardKinematics(self.model, self.data, q)
+        return [self._col_position_np(i) for i in range(n)]
 
-    def fk(self, q):
+    def fk(self, q, out=None):
         """Compute the end effector position of the robot in cartesian space
-        given the joint configuration.
+        given the joint configuration. For numeric joint angles the result can
+        be written into the preallocated array out.
         """
         if isinstance(q, np.ndarray):
-            m = np.zeros(6)
-        else:
-            m = ca.SX.zeros(6)
+            return self._fk_np(q, out)
+        return self._fk_sx(q)
+
+    def _fk_np(self, q, out=None):
+        m = np.empty(6) if out is None else out
+        pin.forwardKinematics(self.model, self.data, q)
+        h = pin.updateFramePlacement(self.model, self.data, self.ee_id)
+        m[:3] = h.translation
+        m[3:] = pin.log3(h.rotation)
+        return m
+
+    def _fk_sx(self, q):
+        m = ca.SX.zeros(6)
         h = self.hom_transform_endeffector(q)
         m[:3] = h[:3, 3]
-        m[3:] = R.from_matrix(h[:3, :3]).as_rotvec()
+        m[3:] = pin.log3(h[:3, :3])
 
         return m
 
     def hom_transform_endeffector(self, q):
         if isinstance(q, np.ndarray):
-            data = self.model.createData()
-            pin.framesForwardKinematics(self.model, data, q)
-        elif GEN_CA:
+            return self._hom_transform_endeffector_np(q)
+        return self._hom_transform_endeffector_sx(q)
+
+    def _hom_transform_endeffector_np(self, q):
+        pin.forwardKinematics(self.model, self.data, q)
+        h = pin.updateFramePlacement(self.model, self.data, self.ee_id)
+        return h.homogeneous
+
+    def _hom_transform_endeffector_sx(self, q):
+        if GEN_CA:
             data = self.cmodel.createData()
             cpin.framesForwardKinematics(self.cmodel, data, q)
-        if isinstance(q, np.ndarray) or GEN_CA:
             p = data.oMf[self.ee_id].homogeneous
-            if GEN_CA and not isinstance(q, np.ndarray):
-                ca.Function("p", [q], [p]).save(f"{CA_SAVE_PATH}hom_trans.ca")
-        else:
-            p_fun = ca.Function.load(f"{CA_SAVE_PATH}hom_trans.ca")
-            p = p_fun(q)
-        return p
+            ca.Function("p", [q], [p]).save(f"{CA_SAVE_PATH}hom_trans.ca")
+            return p
+        return load_ca_function("hom_trans")(q)
 
     def jacobian_fk(self, q):
         if isinstance(q, np.ndarray):
-            data = self.model.createData()
-            pin.computeForwardKinematicsDerivatives(self.model, data, q, q, q)
-            jac = pin.getFrameJacobian(
-                self.model, data, self.ee_id, pin.LOCAL_WORLD_ALIGNED
+            return self._jacobian_fk_np(q)
+        return self._jacobian_fk_sx(q)
+
+    def _jacobian_fk_np(self, q):
+        return pin.computeFrameJacobian(
+            self.model, self.data, q, self.ee_id, pin.LOCAL_WORLD_ALIGNED
+        )
+
+    def _jacobian_fk_sx(self, q):
+        if GEN_CA:
+            data = self.cmodel.createData()
+            cpin.computeForwardKinematicsDerivatives(self.cmodel, data, q, q, q)
+            jac = cpin.getFrameJacobian(
+                self.cmodel, data, self.ee_id, pin.LOCAL_WORLD_ALIGNED
             )
-        else:
-            if GEN_CA:
-                data = self.cmodel.createData()
-                cpin.computeForwardKinematicsDerivatives(self.cmodel, data, q, q, q)
-                jac = cpin.getFrameJacobian(
-                    self.cmodel, data, self.ee_id, pin.LOCAL_WORLD_ALIGNED
-                )
-                ca.Function("p", [q], [jac]).save(f"{CA_SAVE_PATH}jacobian.ca")
-            else:
-                jac_fun = ca.Function.load(f"{CA_SAVE_PATH}jacobian.ca")
-                jac = jac_fun(q)
-        return jac
+            ca.Function("p", [q], [jac]).save(f"{CA_SAVE_PATH}jacobian.ca")
+            return jac
+        return load_ca_function("jacobian")(q)
 
     def djacobian_fk(self, q, dq):
         if isinstance(q, np.ndarray):
-            data = self.model.createData()
-            pin.computeForwardKinematicsDerivatives(self.model, data, q, dq, dq)
-            djac = pin.getFrameJacobianTimeVariation(
-                self.model, data, self.ee_id, pin.LOCAL_WORLD_ALIGNED
-            )
-        else:
+            return self._djacobian_fk_np(q, dq)
+        return self._djacobian_fk_sx(q, dq)
+
+    def _djacobian_fk_np(self, q, dq):
+        pin.computeJointJacobiansTimeVariation(self.model, self.data, q, dq)
+        return pin.getFrameJacobianTimeVariation(
+            self.model, self.data, self.ee_id, pin.LOCAL_WORLD_ALIGNED
+        )
+
+    def _djacobian_fk_sx(self, q, dq):
+        if GEN_CA:
             data = self.cmodel.createData()
             cpin.computeForwardKinematicsDerivatives(self.cmodel, data, q, dq, dq)
-            if GEN_CA:
-                djac = cpin.getFrameJacobianTimeVariation(
-                    self.cmodel, data, self.ee_id, pin.LOCAL_WORLD_ALIGNED
-                )
-                ca.Function("p", [q, dq], [djac]).save(f"{CA_SAVE_PATH}djacobian.ca")
-            else:
-                djac_fun = ca.Function.load(f"{CA_SAVE_PATH}djacobian.ca")
-                djac = djac_fun(q, dq)
-        return djac
+            djac = cpin.getFrameJacobianTimeVariation(
+                self.cmodel, data, self.ee_id, pin.LOCAL_WORLD_ALIGNED
+            )
+            ca.Function("p", [q, dq], [djac]).save(f"{CA_SAVE_PATH}djacobian.ca")
+            return djac
+        return load_ca_function("djacobian")(q, dq)
+
+    def velocity_ee(self, q, dq, out=None):
+        """Compute the linear end effector velocity. For numeric joint angles
+        the result can be written into the preallocated array out.
+        """
+        if isinstance(q, np.ndarray):
+            return self._velocity_ee_np(q, dq, out)
+        return self._velocity_ee_sx(q, dq)
+
+    def _velocity_ee_np(self, q, dq, out=None):
+        v = self._frame_velocity_np(q, dq).linear
+        if out is None:
+            return v.copy()
+        out[:] = v
+        return out
 
-    def velocity_ee(self, q, dq):
+    def _velocity_ee_sx(self, q, dq):
         jac = self.jacobian_fk(q)
-        v = jac @ dq
-        return v[:3]
+        return jac[:3, :] @ dq
 
-    def acceleration_ee(self, q, dq, ddq):
+    def acceleration_ee(self, q, dq, ddq, out=None):
+        """Compute the linear and angular end effector acceleration. For
+        numeric joint angles the result can be written into the preallocated
+        array out.
+        """
+        if isinstance(q, np.ndarray):
+            return self._acceleration_ee_np(q, dq, ddq, out)
+        return self._acceleration_ee_sx(q, dq, ddq)
+
+    def _acceleration_ee_np(self, q, dq, ddq, out=None):
+        pin.forwardKinematics(self.model, self.data, q, dq, ddq)
+        a = pin.getFrameClassicalAcceleration(
+            self.model, self.data, self.ee_id, pin.LOCAL_WORLD_ALIGNED
+        ).vector
+        if out is None:
+            return a
+        out[:] = a
+        return out
+
+    def _acceleration_ee_sx(self, q, dq, ddq):
+        if GEN_CA:
+            jac = self.jacobian_fk(q)
+            djac = self.djacobian_fk(q, dq)
+            a = djac @ dq + jac @ ddq
+            return a
+        return acceleration_function()(q, dq, ddq)
+
+    def omega_ee(self, q, dq, out=None):
+        """Compute the angular end effector velocity. For numeric joint angles
+        the result can be written into the preallocated array out.
+        """
+        if isinstance(q, np.ndarray):
+            return self._omega_ee_np(q, dq, out)
+        return self._omega_ee_sx(q, dq)
+
+    def _omega_ee_np(self, q, dq, out=None):
+        omega = self._frame_velocity_np(q, dq).angular
+        if out is None:
+            return omega.copy()
+        out[:] = omega
+        return out
+
+    def _omega_ee_sx(self, q, dq):
         jac = self.jacobian_fk(q)
-        djac = self.djacobian_fk(q, dq)
-        a = djac @ dq + jac @ ddq
-        return a
+        return jac[3:, :] @ dq
+
+    def twist_ee(self, q, dq, out=None):
+        """Compute the linear and angular end effector velocity stacked into
+        one 6-vector using a single kinematics pass.
+        """
+        if isinstance(q, np.ndarray):
+            return self._twist_ee_np(q, dq, out)
+        return self._twist_ee_sx(q, dq)
+
+    def _twist_ee_np(self, q, dq, out=None):
+        v = self._frame_velocity_np(q, dq).vector
+        if out is None:
+            return v
+        out[:] = v
+        return out
 
-    def omega_ee(self, q, dq):
+    def _twist_ee_sx(self, q, dq):
         jac = self.jacobian_fk(q)
-        w = jac @ dq
-        return w[3:]
+        return jac @ dq
+
+    def kinematic_state(self, q, dq, ddq):
+        """Compute the end effector twist and acceleration together. For
+        numeric joint angles both come from a single kinematics pass.
+        """
+        if isinstance(q, np.ndarray):
+            return self._kinematic_state_np(q, dq, ddq)
+        return self._twist_ee_sx(q, dq), self._acceleration_ee_sx(q, dq, ddq)
+
+    def _kinematic_state_np(self, q, dq, ddq):
+        pin.forwardKinematics(self.model, self.data, q, dq, ddq)
+        v = pin.getFrameVelocity(
+            self.model, self.data, self.ee_id, pin.LOCAL_WORLD_ALIGNED
+        )
+        a = pin.getFrameClassicalAcceleration(
+            self.model, self.data, self.ee_id, pin.LOCAL_WORLD_ALIGNED
+        )
+        return v.vector, a.vector
+
+    def _frame_velocity_np(self, q, dq):
+        pin.forwardKinematics(self.model, self.data, q, dq)
+        return pin.getFrameVelocity(
+            self.model, self.data, self.ee_id, pin.LOCAL_WORLD_ALIGNED
+        )
 
 
 if __name__ == "__main__":
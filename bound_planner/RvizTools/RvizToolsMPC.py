@@ -140,7 +140,7 @@ class RvizToolsMPC(Node):
         self.robot_pub.publish(robot_state_msg)
 
     def publish_coll_spheres(self, q):
-        obj_centers = [self.robot_model.fk_pos_col(q, i) for i in range(7)]
+        obj_centers = self.robot_model.fk_pos_cols(q)
         obj_radii = self.robot_model.col_joint_sizes
         msg = self.create_obj_spheres_msg(
             self.get_clock().now().to_msg(), obj_centers, obj_radii, ns="robot"
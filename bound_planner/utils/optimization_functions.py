@@ -1,3 +1,5 @@
+import math
+
 import casadi as ca
 import numpy as np
 
@@ -36,13 +38,17 @@ def jac_SO3_inv_right(axis):
     if isinstance(axis, np.ndarray):
         angle = np.linalg.norm(axis) + 1e-6
         ident = np.eye(3)
+        cos_angle = math.cos(angle)
+        sin_angle = math.sin(angle)
     else:
         angle = ca.norm_2(axis) + 1e-6
         ident = ca.MX.eye(3)
+        cos_angle = ca.cos(angle)
+        sin_angle = ca.sin(angle)
     omega_mat = skew_matrix(axis)
     jac_inv = ident + 0.5 * omega_mat
     jac_inv += (
-        (1 / angle**2 - (1 + np.cos(angle)) / (2 * angle * np.sin(angle)))
+        (1 / angle**2 - (1 + cos_angle) / (2 * angle * sin_angle))
         * omega_mat
         @ omega_mat
     )
@@ -53,13 +59,17 @@ def jac_SO3_inv_left(axis):
     if isinstance(axis, np.ndarray):
         angle = np.linalg.norm(axis) + 1e-6
         ident = np.eye(3)
+        cos_angle = math.cos(angle)
+        sin_angle = math.sin(angle)
     else:
         angle = ca.norm_2(axis) + 1e-6
         ident = ca.MX.eye(3)
+        cos_angle = ca.cos(angle)
+        sin_angle = ca.sin(angle)
     omega_mat = skew_matrix(axis)
     jac_inv = ident - 0.5 * omega_mat
     jac_inv += (
-        (1 / angle**2 - (1 + np.cos(angle)) / (2 * angle * np.sin(angle)))
+        (1 / angle**2 - (1 + cos_angle) / (2 * angle * sin_angle))
         * omega_mat
         @ omega_mat
     )
@@ -69,15 +79,18 @@ def jac_SO3_inv_left(axis):
 def skew_matrix(omega):
     if isinstance(omega, ca.DM) or isinstance(omega, np.ndarray):
         mat = np.zeros((3, 3))
-    else:
-        mat = ca.SX.zeros((3, 3))
-    mat[0, 1] = -omega[2]
-    mat[1, 0] = omega[2]
-    mat[0, 2] = omega[1]
-    mat[2, 0] = -omega[1]
-    mat[1, 2] = -omega[0]
-    mat[2, 1] = omega[0]
-    return mat
+        mat[0, 1] = -omega[2]
+        mat[1, 0] = omega[2]
+        mat[0, 2] = omega[1]
+        mat[2, 0] = -omega[1]
+        mat[1, 2] = -omega[0]
+        mat[2, 1] = omega[0]
+        return mat
+    return ca.vertcat(
+        ca.horzcat(0, -omega[2], omega[1]),
+        ca.horzcat(omega[2], 0, -omega[0]),
+        ca.horzcat(-omega[1], omega[0], 0),
+    )
 
 
 def rodrigues_matrix(omega, phi):
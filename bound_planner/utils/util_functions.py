@@ -55,11 +55,10 @@ def integrate_joint(model, jerk_matrix, q, dq, ddq, dt):
     dqn = calcVelocity(jerk_matrix, dt, dq, ddq, dt)
     ddqn = calcAcceleration(jerk_matrix, dt, ddq, dt)
     pn_lie, jac_fk, djac_fk = model.forward_kinematics(qn, dqn)
-    ddjac_fk = 0 * djac_fk
-    vn = jac_fk @ dqn
-    vn = np.concatenate((model.velocity_ee(q, dq), model.omega_ee(q, dq)))
+    vn = model.twist_ee(q, dq)
     an = djac_fk @ dqn + jac_fk @ ddqn
-    jn = ddjac_fk @ dqn + 2 * djac_fk @ ddqn + jac_fk @ ddqn
+    # The second Jacobian derivative is taken as zero
+    jn = 2 * djac_fk @ ddqn + jac_fk @ ddqn
     return (qn, dqn, ddqn, pn_lie, vn, an, jn)
 
 